@@ -1,3 +1,5 @@
+import functools
+
 import pulumi
 import pulumi_gcp as gcp
 from pulumi_kubernetes.core.v1 import ServiceAccount
@@ -6,11 +8,58 @@ from pulumi_kubernetes.core.v1 import ServiceAccount
 TYPE_PACKAGE_NAME = "rhg"
 TYPE_INDEX_NAME = "gcp"
 
+# This is GKE default scopes for a new cluster as of 2020-06-11. A list because
+# Pulumi only serializes lists, not tuples. Shared between clusters, so never
+# mutate it.
+_DEFAULT_OAUTH_SCOPES = [
+    "https://www.googleapis.com/auth/devstorage.read_only",
+    "https://www.googleapis.com/auth/logging.write",
+    "https://www.googleapis.com/auth/monitoring",
+    "https://www.googleapis.com/auth/service.management.readonly",
+    "https://www.googleapis.com/auth/servicecontrol",
+    "https://www.googleapis.com/auth/trace.append",
+]
+
+_MAINTENANCE_POLICY = {
+    "recurringWindow": {
+        "startTime": "2020-01-05T12:00:00Z",
+        "endTime": "2020-01-06T12:00:00Z",
+        "recurrence": "FREQ=WEEKLY",
+    }
+}
+
+_NODEPOOL_MANAGEMENT = {"autoRepair": True, "autoUpgrade": True}
+
+_WORKLOAD_METADATA_CONFIG = {"mode": "GKE_METADATA"}
+
+
+def _base_labels(stack, project):
+    """New dict of the labels common to all resources managed by this package.
+
+    Parameters
+    ----------
+    stack : str
+        Pulumi stack name.
+    project : str
+        Pulumi project name.
+
+    Return
+    ------
+    dict
+    """
+    return {
+        "managed-by": "pulumi",
+        "env": stack,
+        "pulumi-project": project,
+    }
+
 
-def pulumi_type_name(component, package, index=None):
+@functools.lru_cache(maxsize=None)
+def pulumi_type_name(component, package, index=__name__):
     """Get Pulumi-style resource type names.
 
-    Names are like ``{package}:{index}:{component}``.
+    Names are like ``{package}:{index}:{component}``. Results are cached, as
+    each component class asks for the same name on every instantiation.
 
     Parameters
     ----------
@@ -19,15 +68,13 @@ def pulumi_type_name(component, package, index=None):
         other words, ``self.__class__.__name__`` if used within a class.
     package : str
         Usually a base library or package name.
-    index : str or None, optional
-        Usually module name. If unspecified, uses ``__name__``.
+    index : str, optional
+        Usually module name. If unspecified, uses this module's ``__name__``.
 
     Return
     ------
     str
     """
-    if index is None:
-        index = __name__
     return f"{package}:{index}:{component}"
 
 
@@ -101,43 +148,21 @@ class WorkerPoolCluster(pulumi.ComponentResource):
         super().__init__(resource_type, resource_name, None, opts)
 
         if oauthscopes is None:
-            # This is GKE default scopes for a new cluster as of 2020-06-11.
-            oauthscopes = [
-                "https://www.googleapis.com/auth/devstorage.read_only",
-                "https://www.googleapis.com/auth/logging.write",
-                "https://www.googleapis.com/auth/monitoring",
-                "https://www.googleapis.com/auth/service.management.readonly",
-                "https://www.googleapis.com/auth/servicecontrol",
-                "https://www.googleapis.com/auth/trace.append",
-            ]
-
-        common_resource_labels = {
-            "managed-by": "pulumi",
-            "env": pulumi.get_stack(),
-            "pulumi-project": pulumi.get_project(),
-        }
+            oauthscopes = _DEFAULT_OAUTH_SCOPES
 
-        core_resource_labels = common_resource_labels.copy()
+        stack = pulumi.get_stack()
+        project = pulumi.get_project()
+        gcp_project = pulumi.Config("gcp").get("project")
 
         self.cluster = gcp.container.Cluster(
             resource_name,
             min_master_version=min_cluster_version,
-            maintenance_policy={
-                "recurringWindow": {
-                    "startTime": "2020-01-05T12:00:00Z",
-                    "endTime": "2020-01-06T12:00:00Z",
-                    "recurrence": "FREQ=WEEKLY",
-                }
-            },
-            resource_labels=core_resource_labels,
+            maintenance_policy=_MAINTENANCE_POLICY,
+            resource_labels=_base_labels(stack, project),
             release_channel=release_channel,
             initial_node_count=1,
             remove_default_node_pool=True,
-            workload_identity_config={
-                "identityNamespace": "{}.svc.id.goog".format(
-                    pulumi.Config("gcp").get("project")
-                )
-            },
+            workload_identity_config={"workloadPool": f"{gcp_project}.svc.id.goog"},
             addons_config={
                 "istioConfig": {
                     "disabled": not enable_servicemesh,
@@ -146,9 +171,18 @@ class WorkerPoolCluster(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self),
         )
 
-        core_resource_labels = common_resource_labels.copy()
-        if preemptible_core:
-            core_resource_labels["preemptible"] = str(preemptible_core).lower()
+        # Settings shared by all node pools.
+        base_node_config = {
+            "image_type": image_type,
+            "oauthScopes": oauthscopes,
+            # Below needed to prevent nodepool from always replacing on deploy.
+            "workloadMetadataConfig": _WORKLOAD_METADATA_CONFIG,
+        }
+
+        core_resource_labels = {
+            **_base_labels(stack, project),
+            **({"preemptible": "true"} if preemptible_core else {}),
+        }
 
         self.nodepool_core = gcp.container.NodePool(
             "nodepool-core",
@@ -158,24 +192,23 @@ class WorkerPoolCluster(pulumi.ComponentResource):
                 "minNodeCount": int(nodecountminmax_core[0]),
             },
             initial_node_count=1,
-            management={"autoRepair": True, "autoUpgrade": True},
+            management=_NODEPOOL_MANAGEMENT,
             node_config={
-                "image_type": image_type,
+                **base_node_config,
                 "disk_size_gb": disk_size_gb_core,
                 "diskType": disktype_core,
                 "machine_type": machinetype_core,
                 "labels": core_resource_labels,
-                "oauthScopes": oauthscopes,
                 "preemptible": bool(preemptible_core),
-                "workloadMetadataConfig": {"nodeMetadata": "GKE_METADATA_SERVER"},
             },
             opts=pulumi.ResourceOptions(parent=self),
         )
 
-        worker_resource_labels = common_resource_labels.copy()
-        worker_resource_labels["dedicated"] = "worker"
-        if preemptible_worker:
-            worker_resource_labels["preemptible"] = str(preemptible_worker).lower()
+        worker_resource_labels = {
+            **_base_labels(stack, project),
+            "dedicated": "worker",
+            **({"preemptible": "true"} if preemptible_worker else {}),
+        }
 
         self.nodepool_worker = gcp.container.NodePool(
             "nodepool-worker",
@@ -185,20 +218,17 @@ class WorkerPoolCluster(pulumi.ComponentResource):
                 "minNodeCount": int(nodecountminmax_worker[0]),
             },
             initial_node_count=1,
-            management={"autoRepair": True, "autoUpgrade": True},
+            management=_NODEPOOL_MANAGEMENT,
             node_config={
-                "image_type": image_type,
+                **base_node_config,
                 "disk_size_gb": disk_size_gb_worker,
                 "diskType": disktype_worker,
                 "labels": worker_resource_labels,
                 "machine_type": machinetype_worker,
-                "oauthScopes": oauthscopes,
                 "preemptible": bool(preemptible_worker),
                 "taints": [
                     {"key": "dedicated", "value": "worker", "effect": "NO_SCHEDULE"}
                 ],
-                # Below needed to prevent nodedpool from always replacing on deploy.
-                "workloadMetadataConfig": {"nodeMetadata": "GKE_METADATA_SERVER"},
             },
             opts=pulumi.ResourceOptions(parent=self),
         )
@@ -241,11 +271,14 @@ class WorkloadIdentity(pulumi.ComponentResource):
         if gcp_display_name is None:
             gcp_display_name = gcp_account_id
 
+        stack = pulumi.get_stack()
+        project = pulumi.get_project()
+
         self.gcp_serviceaccount = gcp.serviceaccount.Account(
             f"{resource_name}-gcp-serviceaccount",
             account_id=gcp_account_id,
             display_name=gcp_display_name,
-            description=f"Managed by pulumi project {pulumi.get_project()} ({pulumi.get_stack()})",
+            description=f"Managed by pulumi project {project} ({stack})",
             opts=pulumi.ResourceOptions(parent=self),
         )
 
@@ -253,11 +286,7 @@ class WorkloadIdentity(pulumi.ComponentResource):
             f"{resource_name}-k8s-serviceaccount",
             metadata={
                 "name": k8s_sa_name,
-                "labels": {
-                    "env": pulumi.get_stack(),
-                    "pulumi-project": pulumi.get_project(),
-                    "managed-by": "pulumi",
-                },
+                "labels": _base_labels(stack, project),
                 # Append annotation as final step to GSA-KSA SA binding.
                 "annotations": {
                     "iam.gke.io/gcp-service-account": self.gcp_serviceaccount.email
@@ -266,24 +295,26 @@ class WorkloadIdentity(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(provider=k8s_provider, parent=self),
         )
 
-        # IAM to bind KSA and GSA fastimpact SAs
-        ksa_gsa_binding_member = pulumi.Output.all(
-            self.gcp_serviceaccount.project, self.k8s_serviceaccount.metadata
+        # IAM to bind KSA and GSA fastimpact SAs. Single join for both the GSA
+        # full ID and the KSA binding member.
+        sa_ids = pulumi.Output.all(
+            self.gcp_serviceaccount.project,
+            self.gcp_serviceaccount.email,
+            self.k8s_serviceaccount.metadata,
         ).apply(
-            lambda x: f"serviceAccount:{x[0]}.svc.id.goog[{x[1].get('namespace')}/{x[1].get('name')}]"
+            lambda x: (
+                f"projects/{x[0]}/serviceAccounts/{x[1]}",
+                f"serviceAccount:{x[0]}.svc.id.goog[{x[2]['namespace']}/{x[2]['name']}]",
+            )
         )
-
-        sa_full_id = pulumi.Output.all(
-            self.gcp_serviceaccount.project, self.gcp_serviceaccount.email
-        ).apply(lambda x: "projects/{}/serviceAccounts/{}".format(*x))
+        sa_full_id = sa_ids.apply(lambda x: x[0])
+        ksa_gsa_binding_member = sa_ids.apply(lambda x: x[1])
 
         self.sa_binding_iammember = gcp.serviceaccount.IAMMember(
             f"{resource_name}-sa-binding-iammember",
             service_account_id=sa_full_id,
             member=ksa_gsa_binding_member,
             role="roles/iam.workloadIdentityUser",
-            opts=pulumi.ResourceOptions(
-                parent=self,
-                depends_on=[self.gcp_serviceaccount, self.k8s_serviceaccount],
-            ),
+            # Depends on both service accounts through service_account_id and member.
+            opts=pulumi.ResourceOptions(parent=self),
         )
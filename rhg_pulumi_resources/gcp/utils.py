@@ -1,9 +1,7 @@
 import pulumi
 
 
-def _kubectl_config_callback(proj, loc, cname, master_auth, endpoint):
-    context = f"gke_{proj}_{loc}_{cname}"
-    config = f"""apiVersion: v1
+_KUBECTL_CONFIG_TEMPLATE = """apiVersion: v1
 clusters:
 - cluster:
     certificate-authority-data: {master_auth}
@@ -27,8 +25,15 @@ users:
         expiry-key: '{{.credential.token_expiry}}'
         token-key: '{{.credential.access_token}}'
       name: gcp
-    """
-    return config
+"""
+
+
+def _kubectl_config_callback(proj, loc, cname, master_auth, endpoint):
+    return _KUBECTL_CONFIG_TEMPLATE.format(
+        master_auth=master_auth,
+        endpoint=endpoint,
+        context=f"gke_{proj}_{loc}_{cname}",
+    )
 
 
 def build_kubectl_config(cluster):
@@ -46,7 +51,7 @@ def build_kubectl_config(cluster):
         cluster.project,
         cluster.location,
         cluster.name,
-        cluster.master_auth["clusterCaCertificate"],
+        cluster.master_auth.cluster_ca_certificate,
         cluster.endpoint,
     ).apply(lambda x: _kubectl_config_callback(*x))
     return conf
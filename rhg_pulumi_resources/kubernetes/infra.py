@@ -1,3 +1,12 @@
+import functools
+import http.client
+import os
+import re
+import shutil
+import tempfile
+import time
+import urllib.request
+
 import pulumi
 from pulumi_kubernetes.yaml import ConfigFile
 
@@ -5,11 +14,21 @@ from pulumi_kubernetes.yaml import ConfigFile
 TYPE_PACKAGE_NAME = "rhg"
 TYPE_INDEX_NAME = "kubernetes"
 
+_ARGO_MANIFEST_URL = "https://raw.githubusercontent.com/argoproj/argo-workflows/{version}/manifests/install.yaml"
+
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rhg_pulumi_resources")
+# Refetch cached manifests older than this many seconds. Tags like "stable" move.
+_CACHE_MAX_AGE = 24 * 60 * 60
+# Seconds to wait on a stalled manifest download before giving up.
+_DOWNLOAD_TIMEOUT = 60
+
 
-def pulumi_type_name(component, package, index=None):
+@functools.lru_cache(maxsize=None)
+def pulumi_type_name(component, package, index=__name__):
     """Get Pulumi-style resource type names.
 
-    Names are like ``{package}:{index}:{component}``.
+    Names are like ``{package}:{index}:{component}``. Results are cached, as
+    each component class asks for the same name on every instantiation.
 
     Parameters
     ----------
@@ -18,20 +37,79 @@ def pulumi_type_name(component, package, index=None):
         other words, ``self.__class__.__name__`` if used within a class.
     package : str
         Usually a base library or package name.
-    index : str or None, optional
-        Usually module name. If unspecified, uses ``__name__``.
+    index : str, optional
+        Usually module name. If unspecified, uses this module's ``__name__``.
 
     Return
     ------
     str
     """
-    if index is None:
-        index = __name__
     return f"{package}:{index}:{component}"
 
 
+def _cached_download(url, filename, max_age=_CACHE_MAX_AGE):
+    """Download a file into the local cache, reusing a recent copy.
+
+    If a stale cached copy exists and the download fails, the stale copy is
+    used and a warning is logged.
+
+    Parameters
+    ----------
+    url : str
+        URL to download from.
+    filename : str
+        Name of the file within the cache directory. Characters other than
+        letters, digits, ``.``, ``_`` and ``-`` are replaced with ``_``.
+    max_age : float, optional
+        Seconds before a cached file is considered stale and downloaded again.
+
+    Return
+    ------
+    str
+        Path to the local cached file.
+    """
+    path = os.path.join(_CACHE_DIR, re.sub(r"[^A-Za-z0-9._-]", "_", filename))
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        age = None  # Not cached yet.
+
+    if age is not None and age < max_age:
+        return path
+
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    # Download to a unique file next to the target then swap, so interrupted or
+    # concurrent downloads never leave a partial manifest in the cache.
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=_CACHE_DIR, delete=False) as tmp:
+            tmp_path = tmp.name
+            with urllib.request.urlopen(url, timeout=_DOWNLOAD_TIMEOUT) as response:
+                shutil.copyfileobj(response, tmp)
+        os.replace(tmp_path, path)
+    except (OSError, http.client.HTTPException) as e:
+        if age is None:
+            raise
+        pulumi.log.warn(
+            f"Failed to refresh {path} from {url}, using stale copy: {e}"
+        )
+    finally:
+        # Nothing is left to remove once os.replace has moved the file into place.
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+
 class ArgoWorkflow(pulumi.ComponentResource):
-    def __init__(self, resource_name, k8s_provider, argo_version=None, opts=None):
+    def __init__(
+        self,
+        resource_name,
+        k8s_provider,
+        argo_version=None,
+        opts=None,
+        manifest_path=None,
+    ):
         """Argo workflow CRDs, services, etc, installed for cluster-wide use.
 
         This assumes the ``argo`` namespace has already been made.
@@ -42,8 +120,13 @@ class ArgoWorkflow(pulumi.ComponentResource):
         k8s_provider : pulumi_kubernetes.provider.Provider
             Must be for the argo namespace.
         argo_version : str or None, optional
-            Argo version to install. If ``None``, installs "stable".
+            Argo version to install. If ``None``, installs "stable". Ignored if
+            ``manifest_path`` is given.
         opts : pulumi.ResourceOptions or None, optional
+        manifest_path : str or None, optional
+            Path to a local Argo install manifest. If ``None``, the manifest for
+            ``argo_version`` is downloaded from GitHub and cached for a day
+            under ``~/.cache/rhg_pulumi_resources/``.
 
         Attributes
         ----------
@@ -57,9 +140,14 @@ class ArgoWorkflow(pulumi.ComponentResource):
         )
         super().__init__(resource_type, resource_name, None, opts)
 
-        # Directly install the latest argo-workflow manifests
+        if manifest_path is None:
+            manifest_path = _cached_download(
+                _ARGO_MANIFEST_URL.format(version=argo_version),
+                f"argo-{argo_version}.yaml",
+            )
+
         self.configfile = ConfigFile(
             name=f"{resource_name}-configfile",
-            file_id=f"https://raw.githubusercontent.com/argoproj/argo-workflows/{argo_version}/manifests/install.yaml",
+            file=manifest_path,
             opts=pulumi.ResourceOptions(provider=k8s_provider, parent=self),
         )
@@ -0,0 +1,55 @@
+import pulumi
+import pytest
+import yaml
+
+
+class PulumiMocks(pulumi.runtime.Mocks):
+    """Echo resource inputs back as outputs, recording every new resource."""
+
+    def __init__(self):
+        self.resources = []
+
+    def new_resource(self, args):
+        self.resources.append(args)
+        outputs = dict(args.inputs)
+        # Fill in outputs the real providers would compute.
+        if args.typ == "gcp:serviceAccount/account:Account":
+            project = pulumi.Config("gcp").get("project")
+            outputs["project"] = project
+            outputs["email"] = (
+                f"{args.inputs['accountId']}@{project}.iam.gserviceaccount.com"
+            )
+        elif args.typ == "gcp:container/cluster:Cluster":
+            outputs["project"] = pulumi.Config("gcp").get("project")
+            outputs["name"] = args.name
+            outputs["location"] = "us-central1"
+            outputs["endpoint"] = "10.0.0.1"
+            outputs["masterAuth"] = {"clusterCaCertificate": "Y2VydA=="}
+        elif args.typ == "kubernetes:core/v1:ServiceAccount":
+            outputs["metadata"] = {"namespace": "default", **args.inputs["metadata"]}
+        return [f"{args.name}_id", outputs]
+
+    def call(self, args):
+        # pulumi_kubernetes.yaml parses manifests through a provider invoke.
+        if args.token == "kubernetes:yaml:decode":
+            return {"result": list(yaml.safe_load_all(args.args["text"]))}
+        return {}
+
+
+def _set_pulumi_mocks(stack, gcp_project):
+    mocks = PulumiMocks()
+    pulumi.runtime.set_mocks(mocks, project="proj", stack=stack, preview=False)
+    pulumi.runtime.set_config("gcp:project", gcp_project)
+    return mocks
+
+
+@pytest.fixture
+def make_pulumi_mocks():
+    """Installs fresh Pulumi mocks, given stack name and ``gcp:project``."""
+    return _set_pulumi_mocks
+
+
+@pytest.fixture
+def pulumi_mocks(make_pulumi_mocks):
+    """Fresh Pulumi mocks for the ``proj`` project's ``dev`` stack."""
+    return make_pulumi_mocks("dev", "proj-dev")
@@ -0,0 +1,100 @@
+import pulumi
+import pulumi_kubernetes as k8s
+import pytest
+
+from rhg_pulumi_resources.gcp import (
+    WorkerPoolCluster,
+    WorkloadIdentity,
+    build_kubectl_config,
+)
+
+
+def _inputs_by_name(mocks):
+    """Map registered resource names to their inputs."""
+    return {r.name: r.inputs for r in mocks.resources}
+
+
+# Run twice in one process to check nothing stack-specific is cached between runs.
+@pytest.mark.parametrize("stack", ["dev", "prod"])
+@pulumi.runtime.test
+def test_workerpoolcluster(make_pulumi_mocks, stack):
+    mocks = make_pulumi_mocks(stack, f"proj-{stack}")
+
+    wpc = WorkerPoolCluster("cluster")
+
+    def check(_):
+        inputs = _inputs_by_name(mocks)
+        labels = {"managed-by": "pulumi", "env": stack, "pulumi-project": "proj"}
+
+        cluster = inputs["cluster"]
+        assert cluster["resourceLabels"] == labels
+        assert cluster["workloadIdentityConfig"] == {
+            "workloadPool": f"proj-{stack}.svc.id.goog"
+        }
+        assert cluster["addonsConfig"] == {"istioConfig": {"disabled": True}}
+        assert cluster["maintenancePolicy"]["recurringWindow"]["recurrence"] == (
+            "FREQ=WEEKLY"
+        )
+
+        core = inputs["nodepool-core"]["nodeConfig"]
+        assert core["labels"] == labels
+        assert core["preemptible"] is False
+        assert core["workloadMetadataConfig"] == {"mode": "GKE_METADATA"}
+        assert len(core["oauthScopes"]) == 6
+
+        worker = inputs["nodepool-worker"]["nodeConfig"]
+        assert worker["labels"] == {
+            **labels,
+            "dedicated": "worker",
+            "preemptible": "true",
+        }
+        assert worker["preemptible"] is True
+        assert worker["taints"] == [
+            {"key": "dedicated", "value": "worker", "effect": "NO_SCHEDULE"}
+        ]
+
+    return pulumi.Output.all(
+        wpc.cluster.urn, wpc.nodepool_core.urn, wpc.nodepool_worker.urn
+    ).apply(check)
+
+
+@pulumi.runtime.test
+def test_workloadidentity(pulumi_mocks):
+    wi = WorkloadIdentity("wi", "my-gsa", "my-ksa", k8s_provider=k8s.Provider("k8s"))
+
+    def check(_):
+        inputs = _inputs_by_name(pulumi_mocks)
+
+        gsa = inputs["wi-gcp-serviceaccount"]
+        assert gsa["description"] == "Managed by pulumi project proj (dev)"
+
+        ksa = inputs["wi-k8s-serviceaccount"]["metadata"]
+        assert ksa["labels"]["env"] == "dev"
+        assert ksa["annotations"] == {
+            "iam.gke.io/gcp-service-account": "my-gsa@proj-dev.iam.gserviceaccount.com"
+        }
+
+        binding = inputs["wi-sa-binding-iammember"]
+        assert binding["serviceAccountId"] == (
+            "projects/proj-dev/serviceAccounts/my-gsa@proj-dev.iam.gserviceaccount.com"
+        )
+        assert binding["member"] == (
+            "serviceAccount:proj-dev.svc.id.goog[default/my-ksa]"
+        )
+        assert binding["role"] == "roles/iam.workloadIdentityUser"
+
+    return wi.sa_binding_iammember.urn.apply(check)
+
+
+@pulumi.runtime.test
+def test_build_kubectl_config(pulumi_mocks):
+    wpc = WorkerPoolCluster("cluster")
+
+    def check(config):
+        context = "gke_proj-dev_us-central1_cluster"
+        assert "certificate-authority-data: Y2VydA==\n" in config
+        assert "server: https://10.0.0.1\n" in config
+        assert f"current-context: {context}\n" in config
+        assert config.endswith("      name: gcp\n")
+
+    return build_kubectl_config(wpc.cluster).apply(check)
@@ -0,0 +1,173 @@
+import http.client
+import os
+import time
+import urllib.error
+import urllib.request
+
+import pulumi
+import pulumi_kubernetes as k8s
+import pytest
+
+from rhg_pulumi_resources.kubernetes import infra
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the download cache at an empty temporary directory."""
+    d = tmp_path / "cache"
+    monkeypatch.setattr(infra, "_CACHE_DIR", str(d))
+    return d
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Local manifest file and its ``file://`` URL."""
+    p = tmp_path / "install.yaml"
+    p.write_text("version: 1\n")
+    return p, p.as_uri()
+
+
+def _age(path, seconds):
+    """Backdate a file's mtime by ``seconds``."""
+    t = time.time() - seconds
+    os.utime(path, (t, t))
+
+
+def test_cached_download_fetches_missing(cache_dir, manifest):
+    _, url = manifest
+
+    path = infra._cached_download(url, "argo-stable.yaml")
+
+    assert path == str(cache_dir / "argo-stable.yaml")
+    assert open(path).read() == "version: 1\n"
+    # No leftover temporary files.
+    assert os.listdir(cache_dir) == ["argo-stable.yaml"]
+
+
+def test_cached_download_reuses_fresh(cache_dir, manifest):
+    src, url = manifest
+    path = infra._cached_download(url, "argo-stable.yaml")
+    src.write_text("version: 2\n")
+
+    assert infra._cached_download(url, "argo-stable.yaml") == path
+    assert open(path).read() == "version: 1\n"
+
+
+def test_cached_download_refetches_stale(cache_dir, manifest):
+    src, url = manifest
+    path = infra._cached_download(url, "argo-stable.yaml")
+    src.write_text("version: 2\n")
+    _age(path, infra._CACHE_MAX_AGE + 1)
+
+    infra._cached_download(url, "argo-stable.yaml")
+
+    assert open(path).read() == "version: 2\n"
+
+
+def test_cached_download_falls_back_to_stale(cache_dir, manifest):
+    src, url = manifest
+    path = infra._cached_download(url, "argo-stable.yaml")
+    _age(path, infra._CACHE_MAX_AGE + 1)
+    src.unlink()
+
+    assert infra._cached_download(url, "argo-stable.yaml") == path
+    assert open(path).read() == "version: 1\n"
+    assert os.listdir(cache_dir) == ["argo-stable.yaml"]
+
+
+def _urlopen_raising(exc):
+    """Fake ``urlopen`` whose response fails mid-read with ``exc``."""
+
+    class Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def read(self, *args):
+            raise exc
+
+    return lambda url, timeout=None: Response()
+
+
+def test_cached_download_falls_back_on_http_error(cache_dir, manifest, monkeypatch):
+    _, url = manifest
+    path = infra._cached_download(url, "argo-stable.yaml")
+    _age(path, infra._CACHE_MAX_AGE + 1)
+    monkeypatch.setattr(
+        urllib.request, "urlopen", _urlopen_raising(http.client.IncompleteRead(b""))
+    )
+
+    assert infra._cached_download(url, "argo-stable.yaml") == path
+    assert open(path).read() == "version: 1\n"
+    # The partial temporary download is cleaned up.
+    assert os.listdir(cache_dir) == ["argo-stable.yaml"]
+
+
+def test_cached_download_cleans_up_on_interrupt(cache_dir, manifest, monkeypatch):
+    _, url = manifest
+    monkeypatch.setattr(urllib.request, "urlopen", _urlopen_raising(KeyboardInterrupt))
+
+    with pytest.raises(KeyboardInterrupt):
+        infra._cached_download(url, "argo-stable.yaml")
+    assert os.listdir(cache_dir) == []
+
+
+def test_cached_download_sets_timeout(cache_dir, manifest, monkeypatch):
+    _, url = manifest
+    urlopen = urllib.request.urlopen
+    timeouts = []
+
+    def recording_urlopen(url, timeout=None):
+        timeouts.append(timeout)
+        return urlopen(url, timeout=timeout)
+
+    monkeypatch.setattr(urllib.request, "urlopen", recording_urlopen)
+
+    infra._cached_download(url, "argo-stable.yaml")
+
+    assert timeouts == [infra._DOWNLOAD_TIMEOUT]
+
+
+def test_cached_download_raises_without_copy(cache_dir, manifest):
+    src, url = manifest
+    src.unlink()
+
+    with pytest.raises(urllib.error.URLError):
+        infra._cached_download(url, "argo-stable.yaml")
+    assert os.listdir(cache_dir) == []
+
+
+def test_cached_download_sanitizes_filename(cache_dir, manifest):
+    _, url = manifest
+
+    path = infra._cached_download(url, "argo-release/3.4.yaml")
+
+    assert path == str(cache_dir / "argo-release_3.4.yaml")
+    assert os.path.isfile(path)
+
+
+@pulumi.runtime.test
+def test_argoworkflow_manifest_path_skips_download(pulumi_mocks, manifest, monkeypatch):
+    src, _ = manifest
+    src.write_text("apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: argo-config\n")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("manifest should not be downloaded")
+
+    monkeypatch.setattr(infra, "_cached_download", fail)
+
+    argo = infra.ArgoWorkflow(
+        "argo",
+        k8s_provider=k8s.Provider("k8s"),
+        manifest_path=str(src),
+    )
+
+    def check(_):
+        names = [r.name for r in pulumi_mocks.resources]
+        assert "argo-config" in names
+
+    # Wait on the ConfigMap's own URN, so its registration has reached the mocks.
+    configmap = argo.configfile.get_resource("v1/ConfigMap", "argo-config")
+    return configmap.apply(lambda r: r.urn).apply(check)
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 
 with open("README.rst") as readme_file:
@@ -16,14 +16,19 @@ setup(
     author="Brewster Malevich",
     author_email="bmalevich@rhg.com",
     url="https://github.com/RhodiumGroup/rhg_pulumi_resourcesa",
-    packages=find_packages(),
+    packages=[
+        "rhg_pulumi_resources",
+        "rhg_pulumi_resources.gcp",
+        "rhg_pulumi_resources.kubernetes",
+        "rhg_pulumi_resources.tests",
+    ],
     python_requires=">=3.7",
     include_package_data=True,
     setup_requires=["setuptools_scm"],
     install_requires=[
-        "pulumi>=2.0.0,<3.0.0",
-        "pulumi-gcp>=3.19.0,<4.0.0",
-        "pulumi-kubernetes>=1.0.0",
+        "pulumi>=3.0.0,<4.0.0",
+        "pulumi-gcp>=6.0.0,<7.0.0",
+        "pulumi-kubernetes>=3.0.0,<4.0.0",
     ],
     zip_safe=False,
     keywords="pulumi",